@@ -7,52 +7,134 @@ It expects your project to conform to the "component" layout described in the do
 A project can override this behavior and provide their own build script by specifying the
 "build_docker" entry in its lamp.json file.
 """
+import argparse
+import collections
+import concurrent.futures
 import contextlib
-import json
+import functools
 import os
 import pathlib
-import shutil
+import posixpath
+import shlex
 import subprocess
+import sys
 import textwrap
+import threading
 import time
 import typing
 
-import jinja2
-import networkx
 from orderedset import OrderedSet
 
+try:
+    # Prefer the faster native json parser when it's installed
+    import orjson as _json
+except ImportError:
+    import json as _json
+
+import aladdin
 from aladdin.lib import logging
-from .configuration import BuildConfig, ComponentConfig, ConfigurationException
+from .configuration import COMPONENTS_PATH, BuildConfig, ComponentConfig, ConfigurationException
 from .build_info import BuildInfo, PythonBuildInfo
 
+if typing.TYPE_CHECKING:
+    import jinja2
+
 logger = logging.getLogger(__name__)
 
+# Where compiled jinja templates are persisted between build-components invocations
+JINJA_BYTECODE_CACHE_DIR = pathlib.Path("~/.cache/aladdin/jinja").expanduser()
+
+# Prefixed to each line of subprocess output to line it up with our log messages
+OUTPUT_INDENT = b" " * 9
+
+# Per-thread presentation of subprocess output. When components are built concurrently, each build
+# thread sets "label" to its component's name so that interleaved output can be told apart.
+_build_output = threading.local()
+
+# Boilerplate pip configuration written into the builder images of python components
+PIP_CONF = textwrap.dedent(
+    """
+    # This is a dynamically generated file created by build-components for the
+    # purpose of building the component containers.
+    # It is copied into our docker images to globally configure pip
+
+    [global]
+    # Install packages under the user directory
+    user = true
+    # Disable the cache dir
+    no-cache-dir = false
+
+    [install]
+    # Disable the .local warning
+    no-warn-script-location = false
+    """
+)
+
+# Boilerplate poetry configuration written into the builder images of python components
+POETRY_TOML = textwrap.dedent(
+    """
+    # This is a dynamically generated file created by build-components for the
+    # purpose of building the component containers.
+    # It is copied into our docker images to globally configure poetry
+
+    [virtualenvs]
+    # We're in a docker container, there's no need for virtualenvs
+    # One should still configure pip to use "--user" behavior so that
+    # poetry-installed packages will be placed in ~/.local
+    create = false
+    """
+)
+
+# The Dockerfile for an editor image, to be formatted with the tag of the image it wraps
+EDITOR_DOCKERFILE = textwrap.dedent(
+    """
+    FROM {tag}
+    CMD "/bin/sh"
+    ENTRYPOINT []
+    """
+)
+
 
 def parse_args(sub_parser):
     subparser = sub_parser.add_parser(
         "build-components", help=__doc__
     )
-    subparser.set_defaults(func=lambda args: main(args.components))
+    subparser.set_defaults(func=lambda args: main(args.components, jobs=args.jobs))
 
     subparser.add_argument(
         "components",
         help="components to build",
         nargs="*",
     )
+    subparser.add_argument(
+        "--jobs",
+        "-j",
+        type=_positive_int,
+        default=BuildConfig.max_build_workers,
+        help="the number of components to build at the same time (default: %(default)s)",
+    )
+
+
+def _positive_int(value: str) -> int:
+    """Parse a command line argument that must be a positive integer."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 
-def main(components):
+def main(components, jobs: int = BuildConfig.max_build_workers):
     """Kick off the build process with data gathered from the system and environment."""
 
     # Provide the lamp.json file data to the build process
-    with open("lamp.json") as lamp_file:
-        lamp = json.load(lamp_file)
+    with open("lamp.json", "rb") as lamp_file:
+        lamp = _json.loads(lamp_file.read())
 
     # Let's get to it!
     build_components(
         lamp=lamp,
         tag_hash=os.getenv("HASH", "local"),
-        build_config=BuildConfig(),
+        build_config=BuildConfig(max_build_workers=jobs),
         components=components,
     )
 
@@ -77,12 +159,12 @@ def build_components(
     :param build_config: The default values for general build settings.
     :param components: The list of components to build, defaults to all of them.
     """
-    components_path = pathlib.Path("components")
-    all_components = [
-        item
-        for item in os.listdir(components_path)
-        if os.path.isdir(components_path / item) and not item.startswith("_")
-    ]
+    with os.scandir(COMPONENTS_PATH) as entries:
+        all_components = [
+            entry.name
+            for entry in entries
+            if entry.is_dir() and not entry.name.startswith("_")
+        ]
 
     if not components:
         # No components were specified at the command line
@@ -91,16 +173,19 @@ def build_components(
             # Build everything if doing a local build
             components = all_components
         else:
-            # Only build components that will be published
+            # Only build components that will be published. Component images are always named
+            # "{project}-{component}", so any other images can't have come from a component.
             prefix = f"{lamp['name']}-"
             components = {
-                image[image.startswith(prefix) and len(prefix):]
+                image[len(prefix):]
                 for image in lamp.get("docker_images", [])
+                if image.startswith(prefix)
             }
 
     # Check that all specified components actually exist in the project
+    existing_components = set(all_components)
     for component in components:
-        if component not in all_components:
+        if component not in existing_components:
             raise ValueError(f"Component '{component}' does not exist")
 
     if not components:
@@ -112,65 +197,174 @@ def build_components(
     # Sort components to attempt some level of determinism in the topological sort later
     presorted_components = sorted(components)
 
-    # Check for cycles in the component dependency graph
-    component_graph = validate_component_dependencies(components=presorted_components)
+    # Check for cycles in the component dependency graph. The whole graph is sorted once so that
+    # each component's dependencies can be ordered from it.
+    component_graph, component_order = validate_component_dependencies(
+        components=presorted_components
+    )
 
     # Let's build in topological order
     ordered_components = [
-        component
-        for component in networkx.algorithms.dag.topological_sort(component_graph)
-        if component in presorted_components
+        component for component in component_order if component in presorted_components
     ]
 
-    # Build each component in turn
-    for component in ordered_components:
-        try:
-            logger.notice("Starting build for %s component", component)
-
-            component_dir = pathlib.Path("components") / component
-            if (component_dir / "component.yaml").exists():
-                # This component will take advantage of our advanced build features.
-                # It may either be a "standard" build or a "compatible" build, depending
-                # on whether they specify a base image to use in their component.yaml file.
-                build_aladdin_component(
-                    lamp=lamp,
-                    build_config=build_config,
-                    component=component,
-                    component_graph=component_graph,
-                    tag_hash=tag_hash,
-                )
-            elif (component_dir / "Dockerfile").exists():
-                # This component is a traditional Dockerfile component and we won't do any
-                # special processing
-                build_traditional_component(
-                    project=lamp["name"], component=component, tag_hash=tag_hash
-                )
-            else:
-                # If neither of these are specified, we do not know how to build this component
-                raise ConfigurationException(
-                    "No component.yaml or Dockerfile found for '%s' component", component
-                )
-
-        except Exception:
-            logger.error("Failed to build image for component: %s", component)
-            raise
+    # Build each component once the components it depends on have been built
+    _build_in_dependency_order(
+        build=functools.partial(
+            build_component,
+            lamp=lamp,
+            build_config=build_config,
+            component_order=component_order,
+            tag_hash=tag_hash,
+        ),
+        components=ordered_components,
+        component_graph=component_graph,
+        component_order=component_order,
+        max_workers=build_config.max_build_workers,
+    )
+
+    logger.success("Built images for components: %s", ", ".join(ordered_components))
+
+
+def build_component(
+    lamp: dict,
+    build_config: BuildConfig,
+    component: str,
+    component_order: typing.Tuple[str],
+    tag_hash: str,
+) -> None:
+    """
+    Build a single component's image(s), according to how the component is defined.
+
+    :param lamp: The data from the project's lamp.json file.
+    :param build_config: The default values for general build settings.
+    :param component: The name of the component to build.
+    :param component_order: The topologically sorted components of the dependency graph.
+    :param tag_hash: The build hash provided by ``aladdin build``.
+    """
+    try:
+        logger.notice("Starting build for %s component", component)
+
+        if os.path.exists(os.path.join(COMPONENTS_PATH, component, "component.yaml")):
+            # This component will take advantage of our advanced build features.
+            # It may either be a "standard" build or a "compatible" build, depending
+            # on whether they specify a base image to use in their component.yaml file.
+            build_aladdin_component(
+                lamp=lamp,
+                build_config=build_config,
+                component=component,
+                component_order=component_order,
+                tag_hash=tag_hash,
+            )
+        elif os.path.exists(os.path.join(COMPONENTS_PATH, component, "Dockerfile")):
+            # This component is a traditional Dockerfile component and we won't do any
+            # special processing
+            build_traditional_component(
+                project=lamp["name"], component=component, tag_hash=tag_hash
+            )
         else:
-            logger.success("Built image for component: %s\n\n", component)
+            # If neither of these are specified, we do not know how to build this component
+            raise ConfigurationException(
+                "No component.yaml or Dockerfile found for '%s' component", component
+            )
+
+    except Exception:
+        logger.error("Failed to build image for component: %s", component)
+        raise
     else:
-        logger.success("Built images for components: %s", ", ".join(ordered_components))
+        logger.success("Built image for component: %s\n\n", component)
+
+
+def _build_in_dependency_order(
+    build: typing.Callable[..., None],
+    components: typing.List[str],
+    component_graph: typing.Dict[str, OrderedSet],
+    component_order: typing.Tuple[str],
+    max_workers: int,
+) -> None:
+    """
+    Concurrently build components, starting each one as soon as its dependencies have been built.
+
+    Components in the graph that were not requested are not built, but are still waited on by the
+    components that depend on them (i.e. they're considered built as soon as they're reached). No
+    new builds are started once any build has failed.
 
+    When more than one component may be built at a time, the subprocess output of each build is
+    labelled with the name of the component being built.
 
-def validate_component_dependencies(components: typing.List[str]) -> networkx.DiGraph:
+    :param build: Called with the ``component`` keyword argument to build that component.
+    :param components: The components to build.
+    :param component_graph: The component dependency graph.
+    :param component_order: The topologically sorted components of the dependency graph.
+    :param max_workers: The maximum number of components to build at the same time.
+    :raises Exception: The first build failure, once any builds already underway have finished.
+    """
+    components = set(components)
+    indegree = _indegrees(component_graph)
+    ready = collections.deque(component for component in component_order if not indegree[component])
+    failures = []
+
+    if max_workers > 1:
+        unlabelled_build = build
+
+        def build(component):
+            _build_output.label = component
+            try:
+                unlabelled_build(component=component)
+            finally:
+                _build_output.label = None
+
+    def release(component):
+        for child in component_graph[component]:
+            indegree[child] -= 1
+            if not indegree[child]:
+                ready.append(child)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        building = {}
+        while ready or building:
+            while ready:
+                component = ready.popleft()
+                if component in components:
+                    building[executor.submit(build, component=component)] = component
+                else:
+                    release(component)
+
+            done, _ = concurrent.futures.wait(
+                building, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                component = building.pop(future)
+                if future.exception() is not None:
+                    failures.append(future.exception())
+                elif not failures:
+                    release(component)
+
+            if failures:
+                # Let any running builds finish, but don't start any new ones
+                ready.clear()
+
+    if failures:
+        raise failures[0]
+
+
+def validate_component_dependencies(
+    components: typing.List[str],
+) -> typing.Tuple[typing.Dict[str, OrderedSet], typing.Tuple[str]]:
     """
     Confirm that the components' dependency hierarchy has no cycles.
 
-    :returns: The component dependency graph
+    Only the provided components and their (transitive) dependencies are added to the graph, so
+    only their component.yaml files are read, no matter how many other components the project has.
+
+    :returns: The component dependency graph, mapping each component to the components that
+              directly depend on it, and the topologically sorted components of that graph.
     """
     # Copy for destructive operations
     components = OrderedSet(components)
 
     # Create the component dependency graph
-    component_graph = networkx.DiGraph()
+    component_graph = {}
 
     visited = OrderedSet()
     while components:
@@ -180,26 +374,61 @@ def validate_component_dependencies(components: typing.List[str]) -> networkx.Di
             visited.add(component)
 
             # Add to graph, if not already present
-            component_graph.add_node(component)
+            component_graph.setdefault(component, OrderedSet())
 
             # Add dependencies to graph (will implicitly add nodes)
             config = ComponentConfig.read_from_component(component)
-            component_graph.add_edges_from(
-                (dependency, component) for dependency in config.dependencies
-            )
+            for dependency in config.dependencies:
+                component_graph.setdefault(dependency, OrderedSet()).add(component)
 
             # Add any dependencies to the list of components to traverse to
             components.update(config.dependencies)
 
-    # Check the graph for cycles
-    try:
-        cycles = networkx.algorithms.cycles.find_cycle(component_graph)
-    except networkx.exception.NetworkXNoCycle:
-        return component_graph
-    else:
+    # Sorting the graph will also check it for cycles
+    return component_graph, _toposort(component_graph)
+
+
+def _toposort(graph: typing.Dict[str, OrderedSet]) -> typing.Tuple[str]:
+    """
+    Topologically sort a dependency graph using Kahn's algorithm.
+
+    :param graph: The graph to sort, mapping each node to its child nodes.
+    :returns: The graph's nodes, with each node appearing after all of its parents.
+    :raises ConfigurationException: If the graph contains any cycles.
+    """
+    indegree = _indegrees(graph)
+    ready = collections.deque(node for node, degree in indegree.items() if not degree)
+    ordered = []
+    while ready:
+        node = ready.popleft()
+        ordered.append(node)
+        for child in graph[node]:
+            indegree[child] -= 1
+            if not indegree[child]:
+                ready.append(child)
+
+    if len(ordered) < len(graph):
+        # Any nodes we could not reach are either part of a cycle or depend on one
+        cycles = [node for node, degree in indegree.items() if degree]
         logger.error("Cycle(s) found in component dependency graph: %s", cycles)
         raise ConfigurationException("Cycle(s) found in component dependency graph", cycles)
 
+    return tuple(ordered)
+
+
+def _indegrees(graph: typing.Dict[str, OrderedSet]) -> typing.Dict[str, int]:
+    """
+    Count the number of parents of each node in a dependency graph.
+
+    :param graph: The graph, mapping each node to its child nodes.
+    :returns: The number of parents, keyed by node.
+    """
+    indegree = {node: 0 for node in graph}
+    for children in graph.values():
+        for child in children:
+            indegree[child] += 1
+    return indegree
+
 
 def build_traditional_component(project: str, component: str, tag_hash: str) -> None:
     """
@@ -215,7 +444,7 @@ def build_traditional_component(project: str, component: str, tag_hash: str) ->
     logger.info("Building standard image for component: %s", component)
     _docker_build(
         tags=f"{project}-{component}:{tag_hash}",
-        dockerfile=pathlib.Path("components") / component / "Dockerfile",
+        dockerfile=COMPONENTS_PATH / component / "Dockerfile",
     )
 
 
@@ -223,7 +452,7 @@ def build_aladdin_component(
     lamp: dict,
     build_config: BuildConfig,
     component: str,
-    component_graph: networkx.DiGraph,
+    component_order: typing.Tuple[str],
     tag_hash: str,
 ) -> None:
     """
@@ -251,7 +480,7 @@ def build_aladdin_component(
     :param lamp: The data from the project's lamp.json file.
     :param build_config: The default values for general build settings.
     ;param component: The name of the component to build.
-    ;param component_graph: The component dependency graph.
+    :param component_order: The topologically sorted components of the dependency graph.
     :param tag_hash: The build hash provided by ``aladdin build``.
     """
     # Read the component.yaml file
@@ -265,7 +494,7 @@ def build_aladdin_component(
     if component_config.language_name == "python":
         build_info = PythonBuildInfo(
             project=lamp["name"],
-            component_graph=component_graph,
+            component_order=component_order,
             component=component,
             config=component_config,
             tag_hash=tag_hash,
@@ -290,8 +519,8 @@ def build_python_component(build_info: PythonBuildInfo) -> None:
     Build the component.
 
     This builds the component image according to the ``component.yaml`` configuration. It will
-    generate a Dockerfile and populate the components/ directory with some ephemeral configuration
-    files to facilate the build. A copy of the utilized Dockerfile will be able to be found at
+    generate a Dockerfile and provide it to the docker build on stdin, along with the components/
+    directory as the build context. A copy of the utilized Dockerfile will be able to be found at
     ``components/<component>/_build.dockerfile`` for debugging and development purposes.
 
     :param build_info: The build info populated from the config and command line arguments.
@@ -305,107 +534,91 @@ def build_python_component(build_info: PythonBuildInfo) -> None:
             f"Unsupported python version for {build_info.component} component: {language_version}"
         )
 
-    # Load our jinja templates for python images.
+    dockerfile = _get_python_dockerfile_template().render(build_info=build_info)
+
+    # Make the generated Dockerfile available to the component prior to attempting the build
+    if build_info.dev:
+        debug_dockerfile_path = COMPONENTS_PATH / build_info.component / "_build.dockerfile"
+        try:
+            debug_dockerfile_path.write_text(dockerfile)
+        except OSError:
+            # This copy is only informational, so it shouldn't fail the build
+            logger.debug("Unable to write generated Dockerfile to %s", debug_dockerfile_path)
+
+    # The Dockerfile is piped to the build rather than written to the shared components/ directory,
+    # so that concurrent builds can't clobber each other's Dockerfile.
+    _docker_build(tags=build_info.tag, dockerfile=dockerfile.encode())
+
+
+@functools.lru_cache(maxsize=None)
+def _get_python_dockerfile_template() -> "jinja2.Template":
+    """
+    Load and compile the top-level template for a python component Dockerfile.
+
+    The template is compiled once and reused for every component built by this process. The
+    compiled bytecode is also cached on disk so that later processes can skip compilation entirely.
+    """
+    # Deferred, as jinja is only needed once we're actually building a python component
+    import jinja2
+
+    # Load our jinja templates for python images. These are shipped with the package, so there's
+    # no need to check them for changes between renders.
     jinja_env = jinja2.Environment(
         loader=jinja2.PackageLoader(
             "aladdin", "commands/build_components/templates/python"
         ),
-        trim_blocks=True
+        trim_blocks=True,
+        auto_reload=False,
+        cache_size=-1,
+        bytecode_cache=_get_jinja_bytecode_cache(),
     )
 
-    # This is the top-level template for a component Dockerfile
-    jinja_template = jinja_env.get_template("Dockerfile.j2")
+    # Provide the boilerplate files to the templates (including the imported macros)
+    jinja_env.globals.update(pip_conf=PIP_CONF, poetry_toml=POETRY_TOML)
+    jinja_env.filters["write_file"] = _write_file_instruction
 
-    # Place the temporary files for the duration of the build.
-    with build_context(
-        component=build_info.component, dockerfile=jinja_template.render(build_info=build_info)
-    ) as dockerfile_path:
+    return jinja_env.get_template("Dockerfile.j2")
 
-        # Make the generated Dockerfile available to the component prior to attempting the build
-        if build_info.dev:
-            with contextlib.suppress():
-                shutil.copyfile(
-                    dockerfile_path,
-                    pathlib.Path("components") / build_info.component / "_build.dockerfile",
-                )
 
-        _docker_build(tags=build_info.tag)
-
-
-@contextlib.contextmanager
-def build_context(component: str, dockerfile: str) -> typing.Generator:
+def _get_jinja_bytecode_cache() -> typing.Optional["jinja2.BytecodeCache"]:
     """
-    A context manager that writes necessary files to disk for the duration of a docker build.
-
-    It will write three files to the components/ directory:
-        - The contents of dockerfile to components/Dockerfile
-        - A boilerplate pip.conf that ensures --user behavior
-        - A boilerplate poetry.toml that prevents virtual env usage
+    Provide an on-disk cache for compiled jinja templates.
 
-    This writes the provided contents to components/Dockerfile. It then deletes the file upon exit.
+    The cache files are keyed on the aladdin version so that an upgrade never picks up bytecode
+    compiled from an older version's templates.
 
-    :param component: The component to build.
-    :param contents: The Dockerfile contents to use within the contents.
+    :returns: The bytecode cache, or None if the cache directory could not be created.
     """
-    components_path = pathlib.Path("components")
-    pip_conf_path = components_path / "pip.conf"
-    poetry_toml_path = components_path / "poetry.toml"
-    dockerfile_path = components_path / "Dockerfile"
+    import jinja2
+
     try:
-        # In addition to the generated Dockerfile, we provide these files in the build context
-        # so that the Dockerfile can COPY these artifacts into the image. These are boilerplate
-        # files that we don't want to burden the aladdin client project with including.
-        with open(pip_conf_path, "w") as outfile:
-            outfile.write(
-                textwrap.dedent(
-                    """
-                    # This is a dynamically generated file created by build-components for the
-                    # purpose of building the component containers.
-                    # It is copied into our docker images to globally configure pip
-
-                    [global]
-                    # Install packages under the user directory
-                    user = true
-                    # Disable the cache dir
-                    no-cache-dir = false
-
-                    [install]
-                    # Disable the .local warning
-                    no-warn-script-location = false
-                    """
-                )
-            )
+        JINJA_BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        logger.debug("Unable to create jinja bytecode cache at %s", JINJA_BYTECODE_CACHE_DIR)
+        return None
 
-        with open(poetry_toml_path, "w") as outfile:
-            outfile.write(
-                textwrap.dedent(
-                    """
-                    # This is a dynamically generated file created by build-components for the
-                    # purpose of building the component containers.
-                    # It is copied into our docker images to globally configure poetry
-
-                    [virtualenvs]
-                    # We're in a docker container, there's no need for virtualenvs
-                    # One should still configure pip to use "--user" behavior so that
-                    # poetry-installed packages will be placed in ~/.local
-                    create = false
-                    """
-                )
-            )
+    return jinja2.FileSystemBytecodeCache(
+        directory=str(JINJA_BYTECODE_CACHE_DIR), pattern=f"aladdin-{aladdin.__version__}-%s.cache"
+    )
 
-        with open(dockerfile_path, "w") as outfile:
-            outfile.write(dockerfile)
 
-        yield dockerfile_path
-    finally:
-        with contextlib.suppress():
-            dockerfile_path.unlink()
+def _write_file_instruction(contents: str, path: str) -> str:
+    """
+    Render a Dockerfile instruction that writes the contents to a file in the image.
 
-        with contextlib.suppress():
-            pip_conf_path.unlink()
+    This lets the generated Dockerfile provide boilerplate files that we don't want to burden the
+    aladdin client project with including in its build context. The contents are passed to printf
+    on a single line, which (unlike heredocs) works with both BuildKit and the legacy builder.
 
-        with contextlib.suppress():
-            poetry_toml_path.unlink()
+    :param contents: The file contents.
+    :param path: The absolute path of the file in the image.
+    :returns: The RUN instruction.
+    """
+    escaped = contents.replace("\\", "\\\\").replace("%", "%%").replace("\n", "\\n")
+    return (
+        f"RUN mkdir -p {shlex.quote(posixpath.dirname(path))} "
+        f"&& printf {shlex.quote(escaped)} > {shlex.quote(path)}"
+    )
 
 
 def build_editor_image(build_info: BuildInfo) -> None:
@@ -424,13 +637,8 @@ def build_editor_image(build_info: BuildInfo) -> None:
     # Perform a "no context" docker build
     _docker_build(
         tags=build_info.editor_tag,
-        dockerfile=textwrap.dedent(
-            f"""
-            FROM {build_info.tag}
-            CMD "/bin/sh"
-            ENTRYPOINT []
-            """
-        ).encode(),
+        dockerfile=EDITOR_DOCKERFILE.format(tag=build_info.tag).encode(),
+        context=False,
     )
 
 
@@ -438,6 +646,7 @@ def _docker_build(
     tags: typing.Union[str, typing.List[str]],
     buildargs: dict = None,
     dockerfile: typing.Union[pathlib.Path, bytes] = None,
+    context: bool = True,
 ) -> None:
     """
     A convenience wrapper for calling out to "docker build".
@@ -448,9 +657,10 @@ def _docker_build(
     :param buildargs: Values for ARG instructions in the dockerfile.
     :param dockerfile: The dockerfile to build against. If not provided, it's assumed that a
                        Dockerfile is present in the context directory. If it's a bytes object, it
-                       will be provided to the docker build process on stdin and a "no context"
-                       build will take place. Otherwise, a normal docker build will be performed
-                       with the specified Dockerfile.
+                       will be provided to the docker build process on stdin. Otherwise, a normal
+                       docker build will be performed with the specified Dockerfile.
+    :param context: Whether to send the build context. If False, the dockerfile must be a bytes
+                    object and a "no context" build will take place.
     """
     buildargs = buildargs or {}
     buildargs.setdefault("CACHE_BUST", str(time.time()))
@@ -460,6 +670,11 @@ def _docker_build(
 
     cmd = ["env", f"DOCKER_BUILDKIT={docker_buildkit}", "docker", "build"]
 
+    # Concurrent builds can't share the terminal for BuildKit's interactive progress display
+    label = getattr(_build_output, "label", None)
+    if label and str(docker_buildkit) != "0":
+        cmd.append("--progress=plain")
+
     for key, value in buildargs.items():
         cmd.extend(["--build-arg", f"{key}={value}"])
 
@@ -467,37 +682,54 @@ def _docker_build(
     for tag in tags:
         cmd.extend(["--tag", tag])
 
-    if isinstance(dockerfile, bytes):
-        # If we receive the Dockerfile as content, we should pipe it to stdin.
+    if not context:
+        # The Dockerfile content is piped to stdin in place of the context.
         # This is the "no context" build.
         cmd.extend(["-"])
     else:
-        # Otherwise, they can specify the path to the Dockerfile to use or let docker
-        # find one in the context directory.
-        if dockerfile:
+        # Otherwise, they can provide the Dockerfile content to pipe to stdin, specify the path
+        # to the Dockerfile to use or let docker find one in the context directory.
+        if isinstance(dockerfile, bytes):
+            cmd.extend(["-f", "-"])
+        elif dockerfile:
             cmd.extend(["-f", dockerfile.as_posix()])
-        cmd.extend(["components"])
+        cmd.extend([COMPONENTS_PATH.as_posix()])
 
     logger.debug("Docker build command: %s", " ".join(cmd))
-    _check_call(cmd, stdin=dockerfile if isinstance(dockerfile, bytes) else None)
+    _check_call(cmd, stdin=dockerfile if isinstance(dockerfile, bytes) else None, label=label)
 
 
-def _check_call(cmd: typing.List[str], stdin: bytes = None) -> None:
+def _check_call(cmd: typing.List[str], stdin: bytes = None, label: str = None) -> None:
     """
     Make a subprocess call and indent its output to match our python logging format.
 
     :param cmd: The command to run.
     :param stdin: Data to send to the subprocess as its input.
+    :param label: If provided, the subprocess's stderr is captured along with its stdout and each
+                  line of output is prefixed with this label.
     """
-    if stdin is None:
-        ps = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-        subprocess.run(["sed", "-e", "s/^/         /"], stdin=ps.stdout, check=True)
-        ps.wait()
-        if ps.returncode:
-            raise subprocess.CalledProcessError(ps.returncode, cmd)
-    else:
-        ps = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE)
-        stdout, stderr = ps.communicate(input=stdin)
-        if ps.returncode:
-            raise subprocess.CalledProcessError(ps.returncode, cmd)
-        subprocess.run(["sed", "-e", "s/^/         /"], input=stdout, check=True)
+    ps = subprocess.Popen(
+        cmd,
+        stdin=None if stdin is None else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=None if label is None else subprocess.STDOUT,
+    )
+    prefix = OUTPUT_INDENT if label is None else OUTPUT_INDENT + f"[{label}] ".encode()
+
+    if stdin is not None:
+        # Feed stdin from another thread so that a chatty process can't block us on a full pipe
+        def feed_stdin():
+            with contextlib.suppress(BrokenPipeError), ps.stdin:
+                ps.stdin.write(stdin)
+
+        threading.Thread(target=feed_stdin, daemon=True).start()
+
+    # Write anything already buffered to stdout before writing to the underlying binary stream
+    sys.stdout.flush()
+    with ps.stdout:
+        for line in ps.stdout:
+            sys.stdout.buffer.write(prefix + line)
+            sys.stdout.buffer.flush()
+
+    if ps.wait():
+        raise subprocess.CalledProcessError(ps.returncode, cmd)
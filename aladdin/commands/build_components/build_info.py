@@ -1,11 +1,11 @@
 import abc
 import dataclasses
-import pathlib
+import functools
 import typing
 
-import networkx
+from cached_property import cached_property
 
-from .configuration import UNDEFINED, ComponentConfig, UserInfo
+from .configuration import COMPONENTS_PATH, UNDEFINED, ComponentConfig, UserInfo
 
 
 @dataclasses.dataclass
@@ -17,7 +17,7 @@ class BuildInfo(abc.ABC):
     """
 
     project: str
-    component_graph: networkx.DiGraph
+    component_order: typing.Tuple[str]
     component: str
     config: ComponentConfig
     tag_hash: str
@@ -45,7 +45,7 @@ class BuildInfo(abc.ABC):
     def language_name(self) -> str:
         return self.config.language_name
 
-    @property
+    @cached_property
     def language_version(self) -> str:
         return self.config.language_version or self.default_language_version
 
@@ -75,29 +75,26 @@ class BuildInfo(abc.ABC):
     def workdir_create(self):
         return self.config.image_workdir.get("create", self.config.image_base is UNDEFINED)
 
-    @property
+    @cached_property
     def workdir(self):
         return self.config.image_workdir.get(
             "path", "/code" if self.config.image_base is UNDEFINED else None
         )
 
-    @property
+    @cached_property
     def user_info(self) -> UserInfo:
         default_name = "aladdin-user"
-        name = self.config.image_user_info.name or default_name
+        user_info = self.config.image_user_info
+        name = user_info.name or default_name
         return UserInfo(
-            create=self.config.image_user_info.create or self.config.image_base is UNDEFINED,
+            create=user_info.create or self.config.image_base is UNDEFINED,
             name=name,
-            group=(self.config.image_user_info.group or name),
-            home=(self.config.image_user_info.home or f"/home/{name}"),
-            sudo=(
-                self.dev
-                if self.config.image_user_info.sudo is UNDEFINED
-                else self.config.image_user_info.sudo
-            ),
+            group=(user_info.group or name),
+            home=(user_info.home or f"/home/{name}"),
+            sudo=(self.dev if user_info.sudo is UNDEFINED else user_info.sudo),
         )
 
-    @property
+    @cached_property
     def dependencies(self) -> typing.Tuple[str]:
         """
         The topologically sorted list of dependencies required for this component.
@@ -105,12 +102,20 @@ class BuildInfo(abc.ABC):
         This will include the complete hierarchy of dependencies for this component, so it is only
         necessary to enumerate a component's direct dependencies in the component.yaml file.
         """
-        dependencies = networkx.algorithms.dag.ancestors(self.component_graph, self.component)
+        # Collect the complete hierarchy of dependencies
+        dependencies = set()
+        pending = list(self.config.dependencies)
+        while pending:
+            dependency = pending.pop()
+            if dependency not in dependencies:
+                dependencies.add(dependency)
+                pending.extend(ComponentConfig.read_from_component(dependency).dependencies)
+
         return tuple(
-            networkx.algorithms.dag.topological_sort(self.component_graph.subgraph(dependencies))
+            component for component in self.component_order if component in dependencies
         )
 
-    @property
+    @cached_property
     def components(self) -> typing.Tuple[str]:
         """
         The topologically sorted list of dependencies required for this component followed by this
@@ -121,7 +126,7 @@ class BuildInfo(abc.ABC):
     @property
     def dockerfile(self) -> str:
         """The path to the component's dockerfile, if the file exists."""
-        path = pathlib.Path("components") / self.component / "Dockerfile"
+        path = COMPONENTS_PATH / self.component / "Dockerfile"
         return path if path.exists() else None
 
     @property
@@ -141,7 +146,7 @@ class PythonBuildInfo(BuildInfo):
 
     poetry_version: str
 
-    @property
+    @cached_property
     def base_image(self) -> str:
         """
         If the base image is defined in the component.yaml file, this component will be built as a
@@ -150,7 +155,7 @@ class PythonBuildInfo(BuildInfo):
         """
         return self.config.image_base or self.builder_image
 
-    @property
+    @cached_property
     def builder_image(self) -> str:
         """
         The image to be used to build and install any python dependencies.
@@ -168,7 +173,18 @@ class PythonBuildInfo(BuildInfo):
         :param component: The component to check, defaults to the current component.
         :returns: Whether the required files are present.
         """
-        component_path = pathlib.Path("components") / (component or self.component)
-        pyproject_path = component_path / "pyproject.toml"
-        lock_path = component_path / "poetry.lock"
-        return pyproject_path.exists() and lock_path.exists()
+        return _is_poetry_project(component or self.component)
+
+
+@functools.lru_cache(maxsize=None)
+def _is_poetry_project(component: str) -> bool:
+    """
+    Return whether the component directory contains both a pyproject.toml and a poetry.lock file.
+
+    This is memoized per component, as the templates check each component many times per render
+    and the files are not expected to come or go over the course of a build.
+    """
+    component_path = COMPONENTS_PATH / component
+    pyproject_path = component_path / "pyproject.toml"
+    lock_path = component_path / "poetry.lock"
+    return pyproject_path.exists() and lock_path.exists()
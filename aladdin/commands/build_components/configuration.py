@@ -5,6 +5,12 @@ import typing
 
 import yaml
 
+try:
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 # You won't be able to instantiate this outside of this module
 class _Undefined:
@@ -21,6 +27,9 @@ UNDEFINED = _Undefined()
 
 del _Undefined
 
+# The project directory containing all of the components
+COMPONENTS_PATH = pathlib.Path("components")
+
 
 class ConfigurationException(Exception):
     """Raised if there is an error in the component.yaml or the component structure."""
@@ -44,21 +53,97 @@ class UserInfo:
         return f"{self.name}:{self.group}"
 
 
+def _make_accessor(
+    path: str, default: typing.Any = UNDEFINED
+) -> typing.Callable[..., typing.Any]:
+    """
+    Create a function that looks up a dot-delimited path in the component.yaml data.
+
+    The path is split once, when the accessor is created, and the accessor performs the lookup as
+    a fixed sequence of dict lookups (rather than looping over the keys).
+
+    :param path: The dot-delimited path to the config value, at most three keys deep.
+    :param default: The value for the accessor to return if the config value was not found. Mutable
+                    defaults should instead be passed to the accessor, so that each lookup gets a
+                    fresh copy.
+    :returns: The accessor, which takes the config data to look the path up in and, optionally, a
+              default overriding the one above.
+    """
+    keys = path.split(".")
+    accessor_default = default
+
+    if len(keys) == 1:
+        (key,) = keys
+
+        def accessor(data: dict, default: typing.Any = accessor_default) -> typing.Any:
+            return data.get(key, default) if isinstance(data, dict) else default
+
+    elif len(keys) == 2:
+        key1, key2 = keys
+
+        def accessor(data: dict, default: typing.Any = accessor_default) -> typing.Any:
+            if not isinstance(data, dict):
+                return default
+            value = data.get(key1)
+            if not isinstance(value, dict):
+                return default
+            return value.get(key2, default)
+
+    elif len(keys) == 3:
+        key1, key2, key3 = keys
+
+        def accessor(data: dict, default: typing.Any = accessor_default) -> typing.Any:
+            if not isinstance(data, dict):
+                return default
+            value = data.get(key1)
+            if not isinstance(value, dict):
+                return default
+            value = value.get(key2)
+            if not isinstance(value, dict):
+                return default
+            return value.get(key3, default)
+
+    else:
+        raise ValueError(f"Config paths may be at most three keys deep: {path}")
+
+    return accessor
+
+
+# Accessors for the config values exposed by ComponentConfig
+_META_VERSION = _make_accessor("meta.version", 1)
+_LANGUAGE_NAME = _make_accessor("language.name")
+_LANGUAGE_VERSION = _make_accessor("language.version")
+_LANGUAGE_SPEC = _make_accessor("language.spec")
+_IMAGE_BASE = _make_accessor("image.base")
+_IMAGE_PACKAGES = _make_accessor("image.packages")
+_IMAGE_USER_CREATE = _make_accessor("image.user.create")
+_IMAGE_USER_NAME = _make_accessor("image.user.name")
+_IMAGE_USER_GROUP = _make_accessor("image.user.group")
+_IMAGE_USER_HOME = _make_accessor("image.user.home")
+_IMAGE_USER_SUDO = _make_accessor("image.user.sudo")
+_IMAGE_WORKDIR = _make_accessor("image.workdir")
+_DEPENDENCIES = _make_accessor("dependencies")
+
+
 class ComponentConfig:
     """The representation of the component.yaml."""
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def read_from_component(cls, component: str) -> "ComponentConfig":
         """
         Read a component's ``component.yaml`` file into a ``ComponentConfig`` object.
 
+        The result is memoized per component, as the component.yaml files are not expected to
+        change over the course of a build and the same config is requested many times.
+
         :param component: The component's config to read.
         :returns: The config data for the component. If the component does not provide a
                   ``component.yaml`` file, this returns an empty config.
         """
         try:
-            with open(pathlib.Path("components") / component / "component.yaml") as file:
-                return cls(yaml.safe_load(file))
+            with open(COMPONENTS_PATH / component / "component.yaml") as file:
+                return cls(yaml.load(file, Loader=_YamlLoader))
         except ConfigurationException:
             raise
         except Exception:
@@ -78,55 +163,58 @@ class ComponentConfig:
         :param default: The value to return if the config value was not found.
         """
         # TODO: Consider using jmespath here instead
-        return functools.reduce(
-            lambda d, key: d.get(key, default) if isinstance(d, dict) else default,
-            path.split("."),
-            self._data,
-        )
+        value = self._data
+        for key in path.split("."):
+            if not isinstance(value, dict):
+                return default
+            value = value.get(key, default)
+            if value is default:
+                return default
+        return value
 
     @property
     def version(self) -> int:
-        return self.get("meta.version", 1)
+        return _META_VERSION(self._data)
 
     @property
     def language_name(self) -> str:
-        name = self.get("language.name")
+        name = _LANGUAGE_NAME(self._data)
         return name.lower() if name else UNDEFINED
 
     @property
     def language_version(self) -> str:
-        version = self.get("language.version")
+        version = _LANGUAGE_VERSION(self._data)
         return str(version) if version else UNDEFINED
 
     @property
     def language_spec(self) -> dict:
-        return self.get("language.spec")
+        return _LANGUAGE_SPEC(self._data)
 
     @property
     def image_base(self) -> str:
-        return self.get("image.base")
+        return _IMAGE_BASE(self._data)
 
     @property
     def image_packages(self) -> typing.List[str]:
-        return self.get("image.packages")
+        return _IMAGE_PACKAGES(self._data)
 
     @property
     def image_user_info(self) -> UserInfo:
         return UserInfo(
-            create=self.get("image.user.create"),
-            name=self.get("image.user.name"),
-            group=self.get("image.user.group"),
-            home=self.get("image.user.home"),
-            sudo=self.get("image.user.sudo"),
+            create=_IMAGE_USER_CREATE(self._data),
+            name=_IMAGE_USER_NAME(self._data),
+            group=_IMAGE_USER_GROUP(self._data),
+            home=_IMAGE_USER_HOME(self._data),
+            sudo=_IMAGE_USER_SUDO(self._data),
         )
 
     @property
     def image_workdir(self) -> dict:
-        return self.get("image.workdir", {})
+        return _IMAGE_WORKDIR(self._data, {})
 
     @property
     def dependencies(self) -> typing.List[str]:
-        return self.get("dependencies", [])
+        return _DEPENDENCIES(self._data, [])
 
 
 @dataclasses.dataclass
@@ -137,3 +225,4 @@ class BuildConfig:
 
     default_python_version: str = "3.8"
     default_poetry_version: str = "1.0.9"
+    max_build_workers: int = 1